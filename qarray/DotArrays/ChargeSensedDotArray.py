@@ -14,7 +14,7 @@ from .ground_state import _ground_state_open, _ground_state_closed
 from ..functions import _optimal_Vg, compute_threshold
 from ..latching_models import LatchingBaseModel
 from ..noise_models import BaseNoiseModel
-from ..python_implementations.helper_functions import free_energy
+from ..python_implementations.helper_functions import free_energy_from_continuous
 from ..qarray_types import CddNonMaxwell, CgdNonMaxwell, VectorList, CdsNonMaxwell, CgsNonMaxwell, Vector, \
     PositiveValuedMatrix
 
@@ -101,6 +101,9 @@ class ChargeSensedDotArray:
 
         # checking the passed algorithm and implementation
         check_algorithm_and_implementation(self.algorithm, self.implementation)
+        # normalising the algorithm and implementation once, so that they can be matched against directly
+        self.algorithm = self.algorithm.lower()
+        self.implementation = self.implementation.lower()
         if self.algorithm == 'threshold':
             assert self.threshold is not None, 'The threshold must be specified when using the thresholded algorithm'
 
@@ -239,7 +242,7 @@ class ChargeSensedDotArray:
                 perturbed_N_sensor = N_sensor.copy()
                 perturbed_N_sensor[..., sensor] = perturbed_N_sensor[..., sensor] + n
                 N_full = np.concatenate([n_open, perturbed_N_sensor + input_noise], axis=-1)
-                F[i, ..., sensor] = free_energy(self.cdd_inv_full, self.cgd_full, vg, N_full)
+                F[i, ..., sensor] = free_energy_from_continuous(self.cdd_inv_full, N_cont, N_full)
 
         signal = lorentzian(np.diff(F, axis=0), 0, self.coulomb_peak_width).sum(axis=0)
         output_noise = self.noise_model.sample_output_noise(N_sensor.shape)
@@ -282,7 +285,7 @@ class ChargeSensedDotArray:
                 perturbed_N_sensor = N_sensor.copy()
                 perturbed_N_sensor[..., sensor] = perturbed_N_sensor[..., sensor] + n
                 N_full = np.concatenate([n_closed, perturbed_N_sensor + input_noise], axis=-1)
-                F[i, ..., sensor] = free_energy(self.cdd_inv_full, self.cgd_full, vg, N_full)
+                F[i, ..., sensor] = free_energy_from_continuous(self.cdd_inv_full, N_cont, N_full)
 
         signal = lorentzian(np.diff(F, axis=0), 0, self.coulomb_peak_width).sum(axis=0)
         output_noise = self.noise_model.sample_output_noise(N_sensor.shape)
@@ -152,6 +152,9 @@ class DotArray:
 
         # checking the passed algorithm and implementation
         check_algorithm_and_implementation(self.algorithm, self.implementation)
+        # normalising the algorithm and implementation once, so that they can be matched against directly
+        self.algorithm = self.algorithm.lower()
+        self.implementation = self.implementation.lower()
         if self.algorithm == 'threshold':
             assert self.threshold is not None, 'The threshold must be specified when using the thresholded algorithm'
 
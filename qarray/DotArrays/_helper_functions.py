@@ -55,18 +55,18 @@ def convert_to_maxwell(
     Tuple[Cdd, CddInv, NegativeValuedMatrix]: A tuple containing the converted Maxwell form of Cdd,
                                               its inverse, and the negative valued matrix of Cgd.
     """
-    cdd_non_maxwell = np.copy(cdd_non_maxwell)
-    cgd_non_maxwell = np.copy(cgd_non_maxwell)
+    cdd_non_maxwell = np.asarray(cdd_non_maxwell)
+    cgd_non_maxwell = np.asarray(cgd_non_maxwell)
 
     # Summing the rows of the non-Maxwell matrices
     cdd_sum = cdd_non_maxwell.sum(axis=1)
     cgd_sum = cgd_non_maxwell.sum(axis=1)
 
-    # Setting the diagonal elements of the cdd_non_maxwell matrix to zero
-    np.fill_diagonal(cdd_non_maxwell, 0)
-
-    # Constructing the Maxwell form of the Cdd matrix
-    cdd_maxwell = np.diag(cdd_sum + cgd_sum) - cdd_non_maxwell
+    # Constructing the Maxwell form of the Cdd matrix, the off diagonal elements are the negated couplings and the
+    # diagonal elements are the total capacitance of each dot. The result is built as a float, so that the total
+    # capacitances are not truncated if the matrices were passed as integers
+    cdd_maxwell = np.negative(cdd_non_maxwell, dtype=np.result_type(cdd_non_maxwell, cgd_non_maxwell, float))
+    np.fill_diagonal(cdd_maxwell, cdd_sum + cgd_sum)
 
     # Creating the Cdd and CddInv instances
     cdd = Cdd(cdd_maxwell)
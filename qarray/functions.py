@@ -94,6 +94,15 @@ def charge_state_changes(n: Tetrad | np.ndarray) -> np.ndarray:
     if not isinstance(n, Tetrad):
         n = Tetrad(n)
 
+    n_dot = n.shape[-1]
+    # if the charge states are integer valued (they are not if there is thermal broadening) and small enough, the
+    # occupations of all the dots can be packed into a single integer per pixel, with eight bits per dot
+    if 0 < n_dot <= 8 and n.size > 0 and n.min() >= 0 and n.max() < 256 and np.all(n == np.rint(n)):
+        packed = np.left_shift(np.asarray(n, dtype=np.int64), 8 * np.arange(n_dot)).sum(axis=-1)
+        change_in_x = packed[1:, :-1] != packed[:-1, :-1]
+        change_in_y = packed[:-1, 1:] != packed[:-1, :-1]
+        return np.logical_or(change_in_x, change_in_y)
+
     change_in_x = np.logical_not(np.isclose(n[1:,:-1,], n[:-1, :-1, :], atol=1e-3)).any(axis=(-1))
     change_in_y = np.logical_not(np.isclose(n[:-1, 1:, :], n[:-1, :-1, :], atol=1e-3)).any(axis=(-1))
     return np.logical_or(change_in_x, change_in_y)
@@ -124,9 +133,13 @@ def _optimal_Vg(cdd_inv: CddInv, cgd: Cgd_holes, n_charges: VectorList, rcond: f
     :param n_charges: the charge state of the dots of shape (n_dot)
     :return:
     '''
+    n_charges = np.asarray(n_charges)
     R = np.linalg.cholesky(cdd_inv).T
-    M = np.linalg.pinv(R @ cgd, rcond=rcond) @ R
-    return np.einsum('ij, ...j', M, n_charges)
+
+    # solving the least squares problem directly for every charge state, rather than forming the pseudo inverse
+    b = R @ n_charges.reshape(-1, n_charges.shape[-1]).T
+    vg, *_ = np.linalg.lstsq(R @ cgd, b, rcond=rcond)
+    return vg.T.reshape(*n_charges.shape[:-1], cgd.shape[-1])
 
 
 def compute_threshold(cdd: Cdd) -> float:
@@ -1 +1,2 @@
+from .closed_dot_configurations import closed_change_configurations_brute_force_jax
 from .open_dot_configurations import open_change_configurations_brute_force_jax
@@ -0,0 +1,29 @@
+"""
+This module contains the functions for computing the ground state of a closed array.
+"""
+from itertools import chain, combinations
+from math import comb
+
+import jax.numpy as jnp
+import numpy as np
+
+
+def closed_change_configurations_brute_force_jax(n_dot, n_charge):
+    """
+    Generates all possible charge configurations for a closed array.
+    :param n_dot: the number of dots in the array
+    :param n_charge: the total number of charge carriers in the array
+    :return: a tensor of shape (C(n_charge + n_dot - 1, n_dot - 1), n_dot) containing all possible charge configurations
+    """
+
+    # by stars and bars, each placement of the n_dot - 1 bars among the n_charge + n_dot - 1 slots gives exactly one
+    # configuration, with the charges on each dot being the number of slots between consecutive bars
+    n_slots = n_charge + n_dot - 1
+    number_of_configurations = comb(n_slots, n_dot - 1)
+    bars = np.fromiter(chain.from_iterable(combinations(range(n_slots), n_dot - 1)), dtype=int,
+                       count=number_of_configurations * (n_dot - 1)).reshape(number_of_configurations, n_dot - 1)
+
+    bars = np.pad(bars, ((0, 0), (1, 0)), constant_values=-1)
+    bars = np.pad(bars, ((0, 0), (0, 1)), constant_values=n_slots)
+    configurations = np.diff(bars, axis=-1) - 1
+    return jnp.asarray(configurations, dtype=float)
@@ -8,7 +8,7 @@ import jax.numpy as jnp
 
 from qarray.jax_implementations.helper_functions import softargmin, hardargmin
 from qarray.qarray_types import VectorList, CddInv, Cgd_holes, Cdd
-from .charge_configuration_generators import open_change_configurations_brute_force_jax
+from .charge_configuration_generators import closed_change_configurations_brute_force_jax
 from ..helper_functions import _batched_vmap
 
 
@@ -24,8 +24,14 @@ def ground_state_closed_brute_force_jax(vg: VectorList, cgd: Cgd_holes, cdd: Cdd
     :return: the lowest energy charge configuration for each dot voltage coordinate vector
    """
 
-    n_list = open_change_configurations_brute_force_jax(n_dot=cdd.shape[0], n_max=n_charge)
-    f = partial(_ground_state_closed_0d, cgd=cgd, cdd_inv=cdd_inv, n_charge=n_charge, n_list=n_list, T=T)
+    # generating only the configurations with the correct number of charges
+    n_list = closed_change_configurations_brute_force_jax(n_dot=cdd.shape[0], n_charge=n_charge)
+    # expanding the free energy, (n - v)^T cdd_inv (n - v) = n^T cdd_inv n - 2 n^T cdd_inv v + v^T cdd_inv v, the
+    # terms depending only on the charge configurations are the same at every point, so are computed once here
+    n_list_cdd_inv = n_list @ cdd_inv
+    n_list_free_energy = jnp.sum(n_list_cdd_inv * n_list, axis=-1)
+    f = partial(_ground_state_closed_0d, cgd=cgd, cdd_inv=cdd_inv, n_list=n_list, n_list_cdd_inv=n_list_cdd_inv,
+                n_list_free_energy=n_list_free_energy, T=T)
 
     match jax.local_device_count():
         case 0:
@@ -39,22 +45,20 @@ def ground_state_closed_brute_force_jax(vg: VectorList, cgd: Cgd_holes, cdd: Cdd
 
 @jax.jit
 def _ground_state_closed_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray,
-                            n_charge: int, n_list, T: float) -> jnp.ndarray:
+                            n_list, n_list_cdd_inv, n_list_free_energy, T: float) -> jnp.ndarray:
     """
     Computes the ground state for a closed array.
     :param vg: the dot voltage coordinate vector
     :param cgd: the dot to dot capacitance matrix
     :param cdd_inv: the inverse of the dot to dot capacitance matrix
-    :param cdd: the dot to dot capacitance matrix
-    :param n_charge: the total number of charge carriers in the array
+    :param n_list: the charge configurations containing the total number of charge carriers in the array
+    :param n_list_cdd_inv: the charge configurations multiplied by cdd_inv, n_list @ cdd_inv
+    :param n_list_free_energy: the free energy of the charge configurations at zero voltage, n^T cdd_inv n
     :return: the lowest energy charge configuration
     """
-
-    mask = (jnp.sum(n_list, axis=-1) != n_charge) * jnp.inf
     v_dash = cgd @ vg
     # computing the free energy of the change configurations
-    F = jnp.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
-    F = F + mask
+    F = n_list_free_energy - 2 * (n_list_cdd_inv @ v_dash) + v_dash @ cdd_inv @ v_dash
 
     return jax.lax.cond(T > 0.,
                         lambda: softargmin(F, n_list, T),
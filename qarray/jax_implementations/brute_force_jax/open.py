@@ -6,6 +6,7 @@ from functools import partial
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 
 from qarray.jax_implementations.helper_functions import softargmin, hardargmin
 from qarray.qarray_types import VectorList, CddInv, Cgd_holes
@@ -15,19 +16,41 @@ from ..helper_functions import _batched_vmap
 
 def ground_state_open_brute_force_jax(vg: VectorList, cgd: Cgd_holes, cdd_inv: CddInv,
                                       max_number_of_charge_carriers: int, T: float = 0,
-                                      batch_size: int = 10000) -> VectorList:
+                                      batch_size: int = 10000, chunk_size: int = 1 << 20) -> VectorList:
     """
     A jax implementation for the ground state function that takes in numpy arrays and returns numpy arrays.
     :param vg: the dot voltage coordinate vectors to evaluate the ground state at
     :param cgd: the dot to dot capacitance matrix
     :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param chunk_size: the maximum number of charge configurations to consider at once, if there are more
+    configurations than this they are iterated over in chunks to limit the memory usage
     :return: the lowest energy charge configuration for each dot voltage coordinate vector
     """
 
     n_dot = cdd_inv.shape[0]
-    n_list = open_change_configurations_brute_force_jax(n_dot=n_dot, n_max=max_number_of_charge_carriers)
+    n_max = max_number_of_charge_carriers
+    # the free energy is computed as ||delta @ L||^2, where cdd_inv = L @ L.T
+    cdd_inv_cholesky = np.linalg.cholesky(cdd_inv)
+
+    if (n_max + 1) ** n_dot <= chunk_size or n_dot == 1:
+        n_list = open_change_configurations_brute_force_jax(n_dot=n_dot, n_max=n_max)
+        f = partial(_ground_state_open_0d, cgd=cgd, cdd_inv_cholesky=cdd_inv_cholesky, n_list=n_list, T=T)
+    else:
+        # splitting the dots into the inner dots, whose configurations make up each chunk, and the outer dots,
+        # whose configurations are iterated over. There is always at least one of each.
+        n_inner = 1
+        while n_inner < n_dot - 1 and (n_max + 1) ** (n_inner + 1) <= chunk_size:
+            n_inner += 1
+        n_list_inner = open_change_configurations_brute_force_jax(n_dot=n_inner, n_max=n_max)
+        n_list_outer = open_change_configurations_brute_force_jax(n_dot=n_dot - n_inner, n_max=n_max)
+        # choosing between the hard and soft argmin here, as T is a python float, rather than tracing both
+        if T > 0.:
+            f = partial(_ground_state_open_0d_chunked_soft, cgd=cgd, cdd_inv_cholesky=cdd_inv_cholesky,
+                        n_list_inner=n_list_inner, n_list_outer=n_list_outer, T=T)
+        else:
+            f = partial(_ground_state_open_0d_chunked_hard, cgd=cgd, cdd_inv_cholesky=cdd_inv_cholesky,
+                        n_list_inner=n_list_inner, n_list_outer=n_list_outer)
 
-    f = partial(_ground_state_open_0d, cgd=cgd, cdd_inv=cdd_inv, n_list=n_list, T=T)
     match jax.local_device_count():
         case 0:
             raise ValueError('Must have at least one device')
@@ -39,19 +62,112 @@ def ground_state_open_brute_force_jax(vg: VectorList, cgd: Cgd_holes, cdd_inv: C
 
 
 @jax.jit
-def _ground_state_open_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray, n_list: VectorList,
+def _ground_state_open_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray, n_list: VectorList,
                           T: float) -> jnp.ndarray:
     """
     Computes the ground state for an open array.
     :param vg: the dot voltage coordinate vector
     :param cgd: the dot to dot capacitance matrix
-    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
     :return: the lowest energy charge configuration
     """
     v_dash = cgd @ vg
     # computing the free energy of the change configurations
-    F = jnp.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
+    Y = (n_list - v_dash) @ cdd_inv_cholesky
+    F = jnp.sum(Y * Y, axis=-1)
     # returning the lowest energy change configuration
     return jax.lax.cond(T > 0.,
                         lambda: softargmin(F, n_list, T),
                         lambda: hardargmin(F, n_list))
+
+
+def _chunk_free_energy(n_outer: jnp.ndarray, v_dash: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray,
+                       n_list_inner: VectorList):
+    """
+    Computes the free energy of one chunk of charge configurations, which pairs one configuration of the outer dots
+    with every configuration of the inner dots.
+    :param n_outer: the configuration of the outer dots
+    :param v_dash: the unconstrained continuous charge distribution
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
+    :param n_list_inner: all the charge configurations of the inner dots
+    :return: the free energies and charge configurations of the chunk
+    """
+    n_list = jnp.concatenate([jnp.broadcast_to(n_outer, (n_list_inner.shape[0], n_outer.shape[0])),
+                              n_list_inner], axis=-1)
+    Y = (n_list - v_dash) @ cdd_inv_cholesky
+    return jnp.sum(Y * Y, axis=-1), n_list
+
+
+@jax.jit
+def _ground_state_open_0d_chunked_hard(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray,
+                                       n_list_inner: VectorList, n_list_outer: VectorList) -> jnp.ndarray:
+    """
+    Computes the ground state for an open array at zero temperature, iterating over the charge configurations in
+    chunks, so that the full list of configurations is never materialised.
+    :param vg: the dot voltage coordinate vector
+    :param cgd: the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
+    :param n_list_inner: all the charge configurations of the inner dots
+    :param n_list_outer: all the charge configurations of the outer dots
+    :return: the lowest energy charge configuration
+    """
+    v_dash = cgd @ vg
+    chunk_free_energy = partial(_chunk_free_energy, v_dash=v_dash, cdd_inv_cholesky=cdd_inv_cholesky,
+                                n_list_inner=n_list_inner)
+
+    def step(carry, n_outer):
+        # keeping track of the lowest energy configuration seen so far
+        F_min, n_min = carry
+        F, n_list = chunk_free_energy(n_outer)
+        arg = jnp.argmin(F)
+        lower = F[arg] < F_min
+        return (jnp.where(lower, F[arg], F_min), jnp.where(lower, n_list[arg], n_min)), None
+
+    # starting from the first chunk, so that the carry has the dtype of the traced free energies
+    F, n_list = chunk_free_energy(n_list_outer[0])
+    arg = jnp.argmin(F)
+    (_, n_min), _ = jax.lax.scan(step, (F[arg], n_list[arg]), n_list_outer[1:])
+    return n_min
+
+
+@jax.jit
+def _ground_state_open_0d_chunked_soft(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray,
+                                       n_list_inner: VectorList, n_list_outer: VectorList, T: float) -> jnp.ndarray:
+    """
+    Computes the thermal expectation of the charge configuration for an open array, iterating over the charge
+    configurations in chunks, so that the full list of configurations is never materialised.
+    :param vg: the dot voltage coordinate vector
+    :param cgd: the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
+    :param n_list_inner: all the charge configurations of the inner dots
+    :param n_list_outer: all the charge configurations of the outer dots
+    :param T: the temperature
+    :return: the thermally averaged charge configuration
+    """
+    v_dash = cgd @ vg
+    chunk_free_energy = partial(_chunk_free_energy, v_dash=v_dash, cdd_inv_cholesky=cdd_inv_cholesky,
+                                n_list_inner=n_list_inner)
+
+    def step(carry, n_outer):
+        # keeping track of a running softmax weighted sum, rescaled to the largest logit seen so far
+        logit_max, weight_sum, n_sum = carry
+        F, n_list = chunk_free_energy(n_outer)
+        logits = -F / T
+        new_logit_max = jnp.maximum(logit_max, logits.max())
+        rescale = jnp.exp(logit_max - new_logit_max)
+        weights = jnp.exp(logits - new_logit_max)
+        return (new_logit_max, weight_sum * rescale + weights.sum(),
+                n_sum * rescale + (n_list * weights[:, None]).sum(axis=0)), None
+
+    # starting from the first chunk, so that the carry has the dtype of the traced free energies
+    F, n_list = chunk_free_energy(n_list_outer[0])
+    logits = -F / T
+    logit_max = logits.max()
+    weights = jnp.exp(logits - logit_max)
+    init = (logit_max, weights.sum(), (n_list * weights[:, None]).sum(axis=0))
+    (_, weight_sum, n_sum), _ = jax.lax.scan(step, init, n_list_outer[1:])
+    return n_sum / weight_sum
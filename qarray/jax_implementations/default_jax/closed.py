@@ -5,6 +5,7 @@ from functools import partial
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 from jaxopt import BoxOSQP
 
 from qarray.jax_implementations.default_jax.charge_configuration_generators import open_charge_configurations_jax
@@ -82,7 +83,10 @@ def ground_state_closed_default_jax(vg: VectorList, n_charge: int, cgd: Cgd_hole
     :return: the lowest energy charge configuration for each dot voltage coordinate vector
    """
 
-    f = partial(_ground_state_closed_0d, cgd=cgd, cdd_inv=cdd_inv, cdd=cdd, n_charge=n_charge, T=T)
+    # the free energy is computed as ||delta @ L||^2, where cdd_inv = L @ L.T
+    cdd_inv_cholesky = np.linalg.cholesky(cdd_inv)
+    f = partial(_ground_state_closed_0d, cgd=cgd, cdd_inv=cdd_inv, cdd_inv_cholesky=cdd_inv_cholesky, cdd=cdd,
+                n_charge=n_charge, T=T)
 
     match jax.local_device_count():
         case 0:
@@ -96,13 +100,15 @@ def ground_state_closed_default_jax(vg: VectorList, n_charge: int, cgd: Cgd_hole
 
 
 @jax.jit
-def _ground_state_closed_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray, cdd: jnp.ndarray,
-                            n_charge: int, T: float) -> jnp.ndarray:
+def _ground_state_closed_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray,
+                            cdd: jnp.ndarray, n_charge: int, T: float) -> jnp.ndarray:
     """
     Computes the ground state for a closed array.
     :param vg: the dot voltage coordinate vector
     :param cgd: the dot to dot capacitance matrix
     :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
     :param cdd: the dot to dot capacitance matrix
     :param n_charge: the total number of charge carriers in the array
     :return: the lowest energy charge configuration
@@ -110,14 +116,16 @@ def _ground_state_closed_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndar
     n_continuous = compute_continuous_solution_closed(cdd=cdd, cgd=cgd, cdd_inv=cdd_inv, n_charge=n_charge, vg=vg)
     n_continuous = jnp.clip(n_continuous, 0, n_charge)
     # eliminating the possibly of negative numbers of change carriers
-    return compute_argmin_closed(n_continuous=n_continuous, cdd_inv=cdd_inv, cgd=cgd, Vg=vg, n_charge=n_charge, T=T)
+    return compute_argmin_closed(n_continuous=n_continuous, cdd_inv_cholesky=cdd_inv_cholesky, cgd=cgd, Vg=vg,
+                                 n_charge=n_charge, T=T)
 
 
-def compute_argmin_closed(n_continuous, cdd_inv, cgd, Vg, n_charge, T: float = 0.):
+def compute_argmin_closed(n_continuous, cdd_inv_cholesky, cgd, Vg, n_charge, T: float = 0.):
     """
     Computes the lowest energy charge configuration for a closed array.
     :param n_continuous: the continuous charge distribution
-    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
     :param cgd: the dot to dot capacitance matrix
     :param Vg: the dot voltage coordinate vector
     :param n_charge: the total number of charge carriers in the array
@@ -128,7 +136,8 @@ def compute_argmin_closed(n_continuous, cdd_inv, cgd, Vg, n_charge, T: float = 0
     mask = (jnp.sum(n_list, axis=-1) != n_charge) * jnp.inf
     v_dash = cgd @ Vg
     # computing the free energy of the change configurations
-    F = jnp.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
+    Y = (n_list - v_dash) @ cdd_inv_cholesky
+    F = jnp.sum(Y * Y, axis=-1)
     F = F + mask
     return jax.lax.cond(T > 0.,
                         lambda: softargmin(F, n_list, T),
@@ -71,7 +71,9 @@ def ground_state_open_default_jax(vg: VectorList, cgd: Cgd_holes, cdd_inv: CddIn
     :param cdd_inv: the inverse of the dot to dot capacitance matrix
     :return: the lowest energy charge configuration for each dot voltage coordinate vector
     """
-    f = partial(_ground_state_open_0d, cgd=cgd, cdd_inv=cdd_inv, T=T)
+    # the free energy is computed as ||delta @ L||^2, where cdd_inv = L @ L.T
+    cdd_inv_cholesky = np.linalg.cholesky(cdd_inv)
+    f = partial(_ground_state_open_0d, cgd=cgd, cdd_inv=cdd_inv, cdd_inv_cholesky=cdd_inv_cholesky, T=T)
     match jax.local_device_count():
         case 0:
             raise ValueError('Must have at least one device')
@@ -84,25 +86,29 @@ def ground_state_open_default_jax(vg: VectorList, cgd: Cgd_holes, cdd_inv: CddIn
 
 
 @jax.jit
-def _ground_state_open_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray, T: float) -> jnp.ndarray:
+def _ground_state_open_0d(vg: jnp.ndarray, cgd: jnp.ndarray, cdd_inv: jnp.ndarray, cdd_inv_cholesky: jnp.ndarray,
+                          T: float) -> jnp.ndarray:
     """
     Computes the ground state for an open array.
     :param vg: the dot voltage coordinate vector
     :param cgd: the dot to dot capacitance matrix
     :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
     :return: the lowest energy charge configuration
     """
     n_continuous = compute_continuous_solution_open(cdd_inv=cdd_inv, cgd=cgd, vg=vg)
     n_continuous = jnp.clip(n_continuous, 0, None)
     # eliminating the possibly of negative numbers of change carriers
-    return compute_argmin_open(n_continuous=n_continuous, cdd_inv=cdd_inv, cgd=cgd, Vg=vg, T=T)
+    return compute_argmin_open(n_continuous=n_continuous, cdd_inv_cholesky=cdd_inv_cholesky, cgd=cgd, Vg=vg, T=T)
 
 
-def compute_argmin_open(n_continuous, cdd_inv, cgd, Vg, T: float = 0.0):
+def compute_argmin_open(n_continuous, cdd_inv_cholesky, cgd, Vg, T: float = 0.0):
     """
     Computes the lowest energy charge configuration for an open array.
     :param n_continuous: the continuous charge distribution
-    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
     :param cgd: the dot to dot capacitance matrix
     :param Vg: the dot voltage coordinate vector
     :return: the lowest energy charge configuration
@@ -112,7 +118,8 @@ def compute_argmin_open(n_continuous, cdd_inv, cgd, Vg, T: float = 0.0):
     n_list = open_charge_configurations_jax(n_continuous)
     v_dash = cgd @ Vg
     # computing the free energy of the change configurations
-    F = jnp.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
+    Y = (n_list - v_dash) @ cdd_inv_cholesky
+    F = jnp.sum(Y * Y, axis=-1)
 
     return jax.lax.cond(T > 0.,
                         lambda: softargmin(F, n_list, T),
@@ -8,11 +8,17 @@ import numpy as np
 def open_change_configurations_brute_force_python(n_dot, n_max):
     """
     Generates all possible charge configurations for an open array.
-    :param n_continuous:
-    :return: a tensor of shape (n_max ** n_dot, n_dot) containing all possible charge configurations
+    :param n_dot: the number of dots in the array
+    :param n_max: the maximum number of charge carriers on each dot
+    :return: a tensor of shape ((n_max + 1) ** n_dot, n_dot) containing all possible charge configurations
     """
-
-    args = np.zeros((n_dot, n_max + 1)) + np.arange(0, n_max + 1)
+    base = np.arange(n_max + 1, dtype=float)
     number_of_configurations = (n_max + 1) ** n_dot
-    configurations = np.stack(np.meshgrid(*args), axis=-1).reshape(number_of_configurations, n_dot)
+
+    # filling each column directly rather than materialising the meshgrid and stacking it
+    configurations = np.empty((number_of_configurations, n_dot), dtype=float)
+    for d in range(n_dot):
+        repeats = (n_max + 1) ** d
+        tiles = (n_max + 1) ** (n_dot - 1 - d)
+        configurations[:, d] = np.tile(np.repeat(base, repeats), tiles)
     return configurations
@@ -1,2 +1,2 @@
 from .closed_dot_configurations import closed_charge_configurations
-from .open_dot_configurations import open_charge_configurations
+from .open_dot_configurations import open_charge_configurations, open_charge_configurations_batched
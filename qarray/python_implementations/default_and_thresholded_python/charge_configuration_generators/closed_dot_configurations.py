@@ -1,13 +1,44 @@
-from functools import partial
-from itertools import product
+from functools import lru_cache
+from itertools import chain, combinations
+from math import comb
 
 import numpy as np
 
 from .open_dot_configurations import open_charge_configurations
 
+# the largest number of dots for which the ceil table is built by filtering bit masks, above this the 2 ** n_dot
+# masks take up too much memory and the combinations are enumerated directly instead
+_MAX_N_DOT_BIT_MASKS = 20
 
-def sum_eq(array, sum):
-    return np.sum(array) == sum
+
+@lru_cache(maxsize=None)
+def _closed_ceil_table(n_dot, k):
+    """
+    Returns an integer table of shape (comb(n_dot, k), n_dot), of whether each dot is ceiled (1) or floored (0),
+    for every way of ceiling exactly k of the n_dot dots, in the same order as filtering
+    itertools.product([0, 1], repeat=n_dot), so that ties in the free energy are broken the same way for any n_dot.
+
+    The table only depends on n_dot and k, so it is cached and shared between calls, and is therefore read only.
+    """
+    if n_dot <= _MAX_N_DOT_BIT_MASKS:
+        # selecting the bit masks with exactly k bits set, then decoding them into rows of bits with dot 0 as the
+        # most significant bit, as in the product order
+        masks = np.arange(1 << n_dot, dtype=np.uint32)
+        popcount = np.zeros(masks.size, dtype=np.uint8)
+        for i in range(n_dot):
+            popcount += ((masks >> i) & 1).astype(np.uint8)
+        shifts = np.arange(n_dot - 1, -1, -1, dtype=np.uint32)
+        table = ((masks[popcount == k, np.newaxis] >> shifts) & 1).astype(np.int8)
+    else:
+        number_of_configurations = comb(n_dot, k)
+        ceil_args = np.fromiter(chain.from_iterable(combinations(range(n_dot), k)), dtype=int,
+                                count=number_of_configurations * k).reshape(number_of_configurations, k)
+        table = np.zeros((number_of_configurations, n_dot), dtype=np.int8)
+        table[np.arange(number_of_configurations)[:, np.newaxis], ceil_args] = 1
+        # the combinations are in lexicographic order, which is the reverse of the product order
+        table = np.ascontiguousarray(table[::-1])
+    table.flags.writeable = False
+    return table
 
 
 def _closed_charge_configurations(n_continuous, n_charge):
@@ -19,10 +50,10 @@ def _closed_charge_configurations(n_continuous, n_charge):
     if (floor_values + 1).sum() < n_charge:
         return np.empty((0, n_dot))
 
-    p = product([0, 1], repeat=floor_values.size)
-    f = partial(sum_eq, sum=n_charge - floor_values.sum())
-    combinations = filter(f, p)
-    return np.stack(list(combinations), axis=0) + floor_values
+    # the dots which are ceiled rather than floored, exactly k of them, enumerated directly rather than by
+    # filtering all 2 ** n_dot floor/ceil combinations
+    k = int(n_charge - floor_values.sum())
+    return floor_values + _closed_ceil_table(n_dot, k)
 
 
 def closed_charge_configurations(n_continuous, n_charge, threshold):
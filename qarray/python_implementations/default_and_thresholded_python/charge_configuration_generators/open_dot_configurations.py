@@ -1,22 +1,74 @@
-from itertools import product
+from functools import lru_cache
 
 import numpy as np
 
 
+@lru_cache(maxsize=None)
+def _ceil_table(k):
+    """
+    Returns a boolean table of shape (2 ** k, k), of whether each of k dots is ceiled (True) or floored (False)
+    in each of the 2 ** k combinations, in the same order as itertools.product([np.floor, np.ceil], repeat=k).
+
+    The table only depends on k, so it is cached and shared between calls, and is therefore read only.
+    """
+    table = ((np.arange(2 ** k)[:, np.newaxis] >> np.arange(k - 1, -1, -1)) & 1).astype(bool)
+    table.flags.writeable = False
+    return table
+
+
 def open_charge_configurations(n_continuous, threshold):
     n_remainder = n_continuous - np.floor(n_continuous)
 
     # computing which dot changes needed to be floor and ceiled, and which can just be rounded
-    args = np.arange(0, n_continuous.size)
-    floor_ceil_args = np.argwhere(np.abs(n_remainder - 0.5) < threshold / 2.)
-    round_args = args[np.logical_not(np.isin(args, floor_ceil_args))]
+    floor_ceil_args = np.flatnonzero(np.abs(n_remainder - 0.5) < threshold / 2.)
+    ceil = _ceil_table(floor_ceil_args.size)
 
     # populating a list of all dot occupations which need to be considered
-    n_list = np.zeros(shape=(2 ** floor_ceil_args.size, n_continuous.size)) * np.nan
-    floor_ceil_list = product([np.floor, np.ceil], repeat=floor_ceil_args.size)
-    for i, ops in enumerate(floor_ceil_list):
-        for j, operation in zip(floor_ceil_args, ops):
-            n_list[i, j] = operation(n_continuous[j])
-        for j in round_args:
-            n_list[i, j] = np.rint(n_continuous[j])
+    n_list = np.tile(np.rint(n_continuous), (ceil.shape[0], 1))
+    n_floor_ceil = n_continuous[floor_ceil_args]
+    n_list[:, floor_ceil_args] = np.where(ceil, np.ceil(n_floor_ceil), np.floor(n_floor_ceil))
+    return n_list
+
+
+def open_charge_configurations_batched(n_continuous, threshold, max_elements=1 << 22):
+    """
+    A batched version of open_charge_configurations, for n_continuous of shape (N, n_dot).
+
+    The points are grouped by the number of dots, k, which need to be floored and ceiled, so that the charge
+    configurations of every point in a group can be stacked into a single array of shape (B, 2 ** k, n_dot).
+    Each group is split into blocks of at most max_elements elements, to bound the memory used.
+    :param n_continuous: the continuous charge distributions of shape (N, n_dot)
+    :param threshold: the threshold to use for the ground state calculation
+    :param max_elements: the maximum number of elements in each yielded n_list
+    :return: an iterator over (indices, n_list) pairs, where indices are the points in the block
+    """
+    n_remainder = n_continuous - np.floor(n_continuous)
+    floor_ceil = np.abs(n_remainder - 0.5) < threshold / 2.
+    k_values = floor_ceil.sum(axis=-1)
+
+    n_dot = n_continuous.shape[-1]
+    for k in np.unique(k_values):
+        group = np.flatnonzero(k_values == k)
+        block = max(1, max_elements // (2 ** k * n_dot))
+        for start in range(0, group.size, block):
+            indices = group[start:start + block]
+            yield indices, _open_charge_configurations_block(n_continuous[indices], floor_ceil[indices], k)
+
+
+def _open_charge_configurations_block(n, floor_ceil, k):
+    """
+    Builds the charge configurations of shape (B, 2 ** k, n_dot), for a block of points which all have k dots to
+    be floored and ceiled.
+    """
+    # the indices of the dots which need to be floored and ceiled, of shape (B, k)
+    floor_ceil_args = np.nonzero(floor_ceil)[1].reshape(n.shape[0], k)
+    ceil = _ceil_table(k)
+
+    n_floor_ceil = np.take_along_axis(n, floor_ceil_args, axis=-1)[:, np.newaxis, :]
+    n_list = np.repeat(np.rint(n)[:, np.newaxis, :], 2 ** k, axis=1)
+    n_list[
+        np.arange(n.shape[0])[:, np.newaxis, np.newaxis],
+        np.arange(2 ** k)[np.newaxis, :, np.newaxis],
+        floor_ceil_args[:, np.newaxis, :]
+    ] = np.where(ceil, np.ceil(n_floor_ceil), np.floor(n_floor_ceil))
     return n_list
@@ -3,7 +3,10 @@ Python implementation of the core functions of the simulator, which are written
 rusty_capacitance_model_core.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from typing import Callable
 
 import numpy as np
 import osqp
@@ -11,19 +14,23 @@ from loguru import logger
 from scipy import sparse
 
 from qarray.python_implementations.default_and_thresholded_python.charge_configuration_generators import (
-    open_charge_configurations, closed_charge_configurations)
+    open_charge_configurations_batched, closed_charge_configurations)
 from qarray.python_implementations.helper_functions import softargmin, hardargmin
 from qarray.qarray_types import CddInv, Cgd_holes, VectorList, Cdd
 
+# the maximum number of elements in the (B, K, n_dot) arrays of charge configurations evaluated at once, points are
+# split into blocks of at most this size so that the memory used does not grow with the number of points
+_MAX_BATCH_ELEMENTS = 1 << 22
+
 
 def compute_analytical_solution_open(cgd, vg):
-    return cgd @ vg
+    return np.einsum('ij, ...j -> ...i', cgd, vg)
 
 
 def compute_analytical_solution_closed(cdd, cgd, n_charge, vg):
-    n_continuous = cgd @ vg
+    n_continuous = np.einsum('ij, ...j -> ...i', cgd, vg)
     # computing the Lagranian multiplier correction due to the array being closed
-    isolation_correction = (n_charge - n_continuous.sum()) * cdd.sum(axis=0) / cdd.sum()
+    isolation_correction = (n_charge - n_continuous.sum(axis=-1, keepdims=True)) * cdd.sum(axis=0) / cdd.sum()
     return n_continuous + isolation_correction
 
 
@@ -38,7 +45,8 @@ def init_osqp_problem(cdd_inv: CddInv, cgd: Cgd_holes, n_charge: int | None = No
     dim = cdd_inv.shape[0]
 
     P = sparse.csc_matrix(cdd_inv)
-    q = -cdd_inv @ cgd @ np.zeros(cgd.shape[-1])
+    # the linear term is updated for every point the solver is used for, so it is initialised at zero
+    q = np.zeros(dim)
 
     # setting up the constraints
     if n_charge is not None:
@@ -53,58 +61,101 @@ def init_osqp_problem(cdd_inv: CddInv, cgd: Cgd_holes, n_charge: int | None = No
         A = sparse.csc_matrix(np.eye(dim))
 
     prob = osqp.OSQP()
-    prob.setup(P, q, A, l, u, verbose=False, polish=polish)
+    # warm starting from the previous solution, as adjacent points in a sweep have near identical solutions
+    prob.setup(P, q, A, l, u, verbose=False, polish=polish, warm_start=True)
     return prob
 
 
-def _ground_state_open_0d(vg: np.ndarray, cgd: np.ndarray, cdd_inv: np.ndarray, threshold: float, prob,
-                          T: float = 0.) -> np.ndarray:
+def _available_cpus() -> int:
+    """
+    Returns the number of cpus this process may run on, respecting the cpu affinity of the process (for example
+    when it is restricted inside a container) where the platform supports it.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def solve_osqp_problems(q: np.ndarray, init_prob: Callable[[], osqp.OSQP],
+                        chunk_size: int = 100, max_workers: int | None = None) -> np.ndarray:
     """
-    :param vg:
-    :param cgd:
-    :param cdd_inv:
-    :param threshold:
-    :return:
+    Solves the quadratic program for every linear term in q. The problems are split into contiguous chunks of a fixed
+    size, to preserve the warm starting between adjacent points, which are solved in parallel threads. OSQP releases
+    the GIL whilst solving, however its workspace is not thread safe so each chunk is solved with its own solver.
+    As the chunks do not depend on the number of threads, neither do the solutions.
+    :param q: the linear terms of the quadratic programs of shape (n_dot, n_problems)
+    :param init_prob: a function returning an initialized OSQP solver
+    :param chunk_size: the number of problems solved in each warm started chain
+    :param max_workers: the maximum number of threads, defaults to the number of available cpus
+    :return: the solutions of shape (n_problems, n_dot)
+    """
+
+    def solve_chunk(q_chunk):
+        prob = init_prob()
+        x = np.zeros((q_chunk.shape[-1], q_chunk.shape[0]))
+        for i, q_i in enumerate(q_chunk.T):
+            prob.update(q=q_i)
+            x[i] = prob.solve().x
+        return x
+
+    chunks = [q[:, start:start + chunk_size] for start in range(0, q.shape[-1], chunk_size)]
+    if max_workers is None:
+        max_workers = _available_cpus()
+    n_workers = min(max_workers, len(chunks))
+    if n_workers <= 1:
+        results = list(map(solve_chunk, chunks))
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(solve_chunk, chunks))
+
+    if len(results) == 0:
+        return np.zeros((0, q.shape[0]))
+    return np.concatenate(results, axis=0)
+
+
+def compute_continuous_solution_open(vg: VectorList, cgd: Cgd_holes, cdd_inv: CddInv,
+                                     init_prob: Callable[[], osqp.OSQP]) -> VectorList:
+    """
+    Computes the continuous charge distribution for an open array, at every dot voltage coordinate vector.
+    :param vg: the list of dot voltage coordinate vectors
+    :param cgd: the dot to dot capacitance matrix
+    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param init_prob: a function returning an initialized OSQP solver
+    :return: the continuous charge distribution of shape (N, n_dot)
     """
     # computing the analytical minimum charge state, subject to no constraints
-    analytical_solution = compute_analytical_solution_open(cgd=cgd, vg=vg)
-    if np.all(analytical_solution > 0.):  # if all changes in the analytical result are positive we can use it directly
-        logger.trace('using the analytical solution')
-        n_continuous = analytical_solution
-    else:  # otherwise we need to use the solver for the constrained problem to get the minimum charge state
-        logger.trace('using the solution from the constrained solver')
-        prob.update(q=-cdd_inv @ cgd @ vg)
-        res = prob.solve()
-        n_continuous = np.clip(res.x, 0, None)
-
-    # eliminating the possibly of negative numbers of change carriers
-    return compute_argmin_open(n_continuous=n_continuous, cdd_inv=cdd_inv, threshold=threshold, cgd=cgd, vg=vg, T=T)
-
-
-def _ground_state_closed_0d(vg: np.ndarray, n_charge: int, cgd: Cgd_holes, cdd: Cdd, cdd_inv: CddInv, prob,
-                            threshold, T: float = 0) -> np.ndarray:
-    """
-    :param vg:
-    :param n_charge:
-    :param cgd:
-    :param cdd:
-    :param cdd_inv:
-    :param threshold:
-    :return:
-    """
-
-    analytical_solution = compute_analytical_solution_closed(cdd=cdd, cgd=cgd, n_charge=n_charge, vg=vg)
-    if np.all(np.logical_and(analytical_solution >= 0., analytical_solution <= n_charge)):
-        logger.trace('using the analytical solution')
-        n_continuous = analytical_solution
-    else:  # otherwise we need to use the solver for the constrained problem to get the minimum charge state
-        logger.trace('using the solution from the constrained solver')
-        prob.update(q=-cdd_inv @ cgd @ vg)
-        res = prob.solve()
-        n_continuous = np.clip(res.x, 0, n_charge)
-
-    return compute_argmin_closed(n_continuous=n_continuous, cdd_inv=cdd_inv, cgd=cgd, vg=vg, n_charge=n_charge,
-                                 threshold=threshold, T=T)
+    n_continuous = compute_analytical_solution_open(cgd=cgd, vg=vg)
+
+    # where the analytical result has non-positive changes we need to use the solver for the constrained problem
+    solver_args = np.flatnonzero(np.any(n_continuous <= 0., axis=-1))
+    logger.trace(f'using the solution from the constrained solver for {solver_args.size} of {vg.shape[0]} points')
+    # computing the linear term of the quadratic program for all these points at once
+    q = -(cdd_inv @ cgd) @ vg[solver_args].T
+    n_continuous[solver_args] = np.clip(solve_osqp_problems(q=q, init_prob=init_prob), 0, None)
+    return n_continuous
+
+
+def compute_continuous_solution_closed(vg: VectorList, n_charge: int, cgd: Cgd_holes, cdd: Cdd, cdd_inv: CddInv,
+                                       init_prob: Callable[[], osqp.OSQP]) -> VectorList:
+    """
+    Computes the continuous charge distribution for a closed array, at every dot voltage coordinate vector.
+    :param vg: the list of dot voltage coordinate vectors
+    :param n_charge: the number of changes in the array
+    :param cgd: the dot to dot capacitance matrix
+    :param cdd: the dot to dot capacitance matrix
+    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param init_prob: a function returning an initialized OSQP solver
+    :return: the continuous charge distribution of shape (N, n_dot)
+    """
+    n_continuous = compute_analytical_solution_closed(cdd=cdd, cgd=cgd, n_charge=n_charge, vg=vg)
+
+    # where the analytical result is out of bounds we need to use the solver for the constrained problem
+    solver_args = np.flatnonzero(np.any(np.logical_or(n_continuous < 0., n_continuous > n_charge), axis=-1))
+    logger.trace(f'using the solution from the constrained solver for {solver_args.size} of {vg.shape[0]} points')
+    # computing the linear term of the quadratic program for all these points at once
+    q = -(cdd_inv @ cgd) @ vg[solver_args].T
+    n_continuous[solver_args] = np.clip(solve_osqp_problems(q=q, init_prob=init_prob), 0, n_charge)
+    return n_continuous
 
 
 def ground_state_open_default_or_thresholded_python(vg: VectorList, cgd: Cgd_holes, cdd_inv: CddInv, threshold: float,
@@ -117,10 +168,10 @@ def ground_state_open_default_or_thresholded_python(vg: VectorList, cgd: Cgd_hol
         :param threshold: the threshold to use for the ground state calculation
         :return: the lowest energy charge configuration for each dot voltage coordinate vector
         """
-    prob = init_osqp_problem(cdd_inv=cdd_inv, cgd=cgd, polish=polish)
-    f = partial(_ground_state_open_0d, cgd=cgd, cdd_inv=cdd_inv, threshold=threshold, prob=prob, T=T)
-    N = map(f, vg)
-    return VectorList(list(N))
+    init_prob = partial(init_osqp_problem, cdd_inv=cdd_inv, cgd=cgd, polish=polish)
+    n_continuous = compute_continuous_solution_open(vg=vg, cgd=cgd, cdd_inv=cdd_inv, init_prob=init_prob)
+    N = compute_argmin_open(n_continuous=n_continuous, threshold=threshold, cdd_inv=cdd_inv, cgd=cgd, vg=vg, T=T)
+    return VectorList(N)
 
 
 def ground_state_closed_default_or_thresholded_python(vg: VectorList, n_charge: int, cgd: Cgd_holes,
@@ -138,34 +189,79 @@ def ground_state_closed_default_or_thresholded_python(vg: VectorList, n_charge:
      :param threshold: the threshold to use for the ground state calculation
      :return: the lowest energy charge configuration for each dot voltage coordinate vector
      """
-    prob = init_osqp_problem(cdd_inv=cdd_inv, cgd=cgd, n_charge=n_charge, polish=polish)
-    f = partial(_ground_state_closed_0d, n_charge=n_charge, cgd=cgd, cdd=cdd, cdd_inv=cdd_inv, prob=prob,
-                threshold=threshold, T=T)
-    N = map(f, vg)
-    return VectorList(list(N))
+    init_prob = partial(init_osqp_problem, cdd_inv=cdd_inv, cgd=cgd, n_charge=n_charge, polish=polish)
+    n_continuous = compute_continuous_solution_closed(vg=vg, n_charge=n_charge, cgd=cgd, cdd=cdd, cdd_inv=cdd_inv,
+                                                      init_prob=init_prob)
+    N = compute_argmin_closed(n_continuous=n_continuous, cdd_inv=cdd_inv, cgd=cgd, vg=vg, n_charge=n_charge,
+                              threshold=threshold, T=T)
+    return VectorList(N)
 
 
 def compute_argmin_open(n_continuous, threshold, cdd_inv, cgd, vg, T=0.):
-    # computing the remainder
-    n_list = open_charge_configurations(n_continuous, threshold)
-    # computing the free energy of the change configurations
-
-    v_dash = cgd @ vg
-    F = np.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
-    # returning the lowest energy change configuration
+    """
+    Computes the lowest energy charge configuration for an open array, at every dot voltage coordinate vector.
+    :param n_continuous: the continuous charge distributions of shape (N, n_dot)
+    :param threshold: the threshold to use for the ground state calculation
+    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cgd: the dot to dot capacitance matrix
+    :param vg: the list of dot voltage coordinate vectors of shape (N, n_gate)
+    :return: the lowest energy charge configurations of shape (N, n_dot)
+    """
+    v_dash = compute_analytical_solution_open(cgd=cgd, vg=vg)
+    cdd_inv_cholesky = np.linalg.cholesky(cdd_inv)
 
-    if T > 0.:
-        return softargmin(F, n_list, T)
-    else:
-        return hardargmin(F, n_list)
+    n = np.zeros_like(n_continuous)
+    for indices, n_list in open_charge_configurations_batched(n_continuous, threshold,
+                                                              max_elements=_MAX_BATCH_ELEMENTS):
+        n[indices] = _batched_argmin(n_list=n_list, v_dash=v_dash[indices], cdd_inv_cholesky=cdd_inv_cholesky, T=T)
+    return n
 
 
 def compute_argmin_closed(n_continuous, cdd_inv, cgd, vg, n_charge, threshold, T=0.):
-    n_list = closed_charge_configurations(n_continuous, n_charge, threshold)
+    """
+    Computes the lowest energy charge configuration for a closed array, at every dot voltage coordinate vector.
+    :param n_continuous: the continuous charge distributions of shape (N, n_dot)
+    :param cdd_inv: the inverse of the dot to dot capacitance matrix
+    :param cgd: the dot to dot capacitance matrix
+    :param vg: the list of dot voltage coordinate vectors of shape (N, n_gate)
+    :param n_charge: the number of changes in the array
+    :param threshold: the threshold to use for the ground state calculation
+    :return: the lowest energy charge configurations of shape (N, n_dot)
+    """
+    v_dash = compute_analytical_solution_open(cgd=cgd, vg=vg)
+    cdd_inv_cholesky = np.linalg.cholesky(cdd_inv)
+
+    # grouping the points by the number of charge configurations, so that each group can be stacked together
+    n_lists = [closed_charge_configurations(n, n_charge, threshold) for n in n_continuous]
+    sizes = np.array([n_list.shape[0] for n_list in n_lists])
 
-    v_dash = cgd @ vg
-    # computing the free energy of the change configurations
-    F = np.einsum('...i, ij, ...j', n_list - v_dash, cdd_inv, n_list - v_dash)
+    n_dot = n_continuous.shape[-1]
+    n = np.zeros_like(n_continuous)
+    for size in np.unique(sizes):
+        group = np.flatnonzero(sizes == size)
+        block = max(1, _MAX_BATCH_ELEMENTS // (max(size, 1) * n_dot))
+        for start in range(0, group.size, block):
+            indices = group[start:start + block]
+            n_list = np.stack([n_lists[i] for i in indices], axis=0)
+            n[indices] = _batched_argmin(n_list=n_list, v_dash=v_dash[indices], cdd_inv_cholesky=cdd_inv_cholesky,
+                                         T=T)
+    return n
+
+
+def _batched_argmin(n_list, v_dash, cdd_inv_cholesky, T=0.):
+    """
+    Computes the lowest energy charge configuration for a group of points with the same number of configurations.
+    :param n_list: the charge configurations of shape (B, K, n_dot)
+    :param v_dash: the unconstrained continuous charge distributions of shape (B, n_dot)
+    :param cdd_inv_cholesky: the lower triangular cholesky factor L of the inverse of the dot to dot capacitance
+    matrix, such that cdd_inv = L @ L.T
+    :return: the lowest energy charge configurations of shape (B, n_dot)
+    """
+    delta = n_list - v_dash[:, np.newaxis, :]
+    # computing the free energy of the change configurations, F = delta^T cdd_inv delta = ||delta @ L||^2, as a
+    # single matmul followed by a squared norm
+    Y = delta @ cdd_inv_cholesky
+    F = np.einsum('bki, bki -> bk', Y, Y)
 
     if T > 0.:
         return softargmin(F, n_list, T)
@@ -4,14 +4,20 @@ from scipy.special import softmax
 
 def free_energy(cdd_inv, cgd, vg, n):
     v_dash = np.einsum('ij, ...j', cgd, vg)
-    # computing the free energy of the change configurations
-    F = np.einsum('...i, ij, ...j', n - v_dash, cdd_inv, n - v_dash)
+    return free_energy_from_continuous(cdd_inv, v_dash, n)
+
+
+def free_energy_from_continuous(cdd_inv, v_dash, n):
+    # computing the free energy of the change configurations, given the continuous minimum v_dash = cgd @ vg
+    delta = n - v_dash
+    F = np.einsum('...i, ...i', delta @ cdd_inv, delta)
     return F
 
 def softargmin(F, n_list, T: float):
-    weights = softmax(-F / T, axis=0)
-    return (n_list * weights[:, None]).sum(axis=0)
+    weights = softmax(-F / T, axis=-1)
+    return (n_list * weights[..., np.newaxis]).sum(axis=-2)
 
 
 def hardargmin(F, n_list):
-    return n_list[np.argmin(F)]
+    args = np.argmin(F, axis=-1)[..., np.newaxis, np.newaxis]
+    return np.take_along_axis(n_list, args, axis=-2)[..., 0, :]
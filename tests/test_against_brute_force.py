@@ -9,6 +9,8 @@ from qarray.jax_implementations.brute_force_jax import ground_state_open_brute_f
     ground_state_closed_brute_force_jax
 from qarray.python_implementations import ground_state_open_default_or_thresholded_python, \
     ground_state_closed_default_or_thresholded_python
+from qarray.python_implementations.brute_force_python import ground_state_open_brute_force_python, \
+    ground_state_closed_brute_force_python
 from qarray.rust_implemenations import ground_state_open_default_or_thresholded_rust, \
     ground_state_closed_default_or_thresholded_rust
 from .GLOBAL_OPTIONS import disable_tqdm, N_ITERATIONS, N_VOLTAGES
@@ -202,3 +204,43 @@ class BruteForceTests(unittest.TestCase):
                     ax[2].imshow(np.abs(n_rust - n_brute_force).sum(axis=-1).T, origin='lower', cmap='Greys')
                     plt.show()
                     self.assertTrue(False)
+
+    def test_quadruple_dot_open_chunked(self):
+        """
+        Test that the chunked jax open brute force ground state function returns the same result as the unchunked one.
+        """
+        for _ in tqdm(range(N_ITERATIONS), disable=disable_tqdm):
+            cdd, cdd_inv, cgd = randomly_generate_matrices(4)
+            vg = np.random.uniform(-5, 5, size=(N_VOLTAGES, 4))
+
+            for T in [0.0, 0.1]:
+                n_unchunked = ground_state_open_brute_force_jax(vg, cgd, cdd_inv, 3, T=T)
+                n_chunked = ground_state_open_brute_force_jax(vg, cgd, cdd_inv, 3, T=T, chunk_size=16)
+                self.assertTrue(np.allclose(n_unchunked, n_chunked, atol=1e-4))
+
+    def test_open_chunked_against_python(self):
+        """
+        Test that the chunked jax open brute force ground state function returns the same result as the python brute
+        force ground state function, for several chunk sizes and so several splits of the inner and outer dots.
+        """
+        for _ in tqdm(range(N_ITERATIONS), disable=disable_tqdm):
+            for n_dot in [4, 5]:
+                cdd, cdd_inv, cgd = randomly_generate_matrices(n_dot)
+                vg = np.random.uniform(-5, 5, size=(N_VOLTAGES, n_dot))
+
+                n_python = ground_state_open_brute_force_python(vg, cgd, cdd_inv, 3, T=0.0)
+                for chunk_size in [4, 16, 64, 256]:
+                    n_chunked = ground_state_open_brute_force_jax(vg, cgd, cdd_inv, 3, T=0.0, chunk_size=chunk_size)
+                    self.assertTrue(np.allclose(n_python, n_chunked), msg=f'n_dot: {n_dot}, chunk_size: {chunk_size}')
+
+    def test_brute_force_python_dtype(self):
+        """
+        Test that the python brute force ground state functions return floats, like every other implementation.
+        """
+        cdd, cdd_inv, cgd = randomly_generate_matrices(2)
+        vg = np.random.uniform(-5, 5, size=(N_VOLTAGES, 2))
+
+        n_open = ground_state_open_brute_force_python(vg, cgd, cdd_inv, 2, T=0.0)
+        n_closed = ground_state_closed_brute_force_python(vg, cgd=cgd, cdd=cdd, cdd_inv=cdd_inv, n_charge=2, T=0.0)
+        self.assertEqual(n_open.dtype, np.float64)
+        self.assertEqual(n_closed.dtype, np.float64)
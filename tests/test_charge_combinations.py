@@ -1,11 +1,19 @@
 import unittest
 from functools import partial
+from itertools import product
+from unittest import mock
 
 import numpy as np
 
+from qarray.jax_implementations.brute_force_jax.charge_configuration_generators import \
+    closed_change_configurations_brute_force_jax
 from qarray.jax_implementations.default_jax import open_charge_configurations_jax
+from qarray.python_implementations.brute_force_python.charge_configuration_generators import \
+    open_change_configurations_brute_force_python
 from qarray.python_implementations.default_and_thresholded_python.charge_configuration_generators import \
-    closed_charge_configurations, open_charge_configurations
+    closed_charge_configurations, open_charge_configurations, open_charge_configurations_batched
+from qarray.python_implementations.default_and_thresholded_python.charge_configuration_generators import \
+    closed_dot_configurations
 from qarray.rust_implemenations.default_and_thresholded_rust.default_and_thresholded import \
     closed_charge_configurations_rust, open_charge_configurations_rust
 from .GLOBAL_OPTIONS import N_ITERATIONS, N_DOT_MAX, N_CHARGE_MAX
@@ -103,6 +111,60 @@ class ChargeCombinationsTests(unittest.TestCase):
                 jax_result = open_charge_configurations_jax(n)
                 self.assertTrue(compare_sets_for_equality(rust_result, jax_result))
 
+    def test_batched_open_dot(self):
+        for n_dot in range(1, N_DOT_MAX):
+            n_continuous = np.random.uniform(0, 10, size=(N_ITERATIONS, n_dot))
+            threshold = np.random.uniform(0, 1)
+            for indices, n_list in open_charge_configurations_batched(n_continuous, threshold):
+                for i, batched_result in zip(indices, n_list):
+                    result = open_charge_configurations(n_continuous[i], threshold)
+                    self.assertTrue(compare_sets_for_equality(result, batched_result))
+
+    def test_batched_open_dot_blocks(self):
+        for n_dot in range(1, N_DOT_MAX):
+            n_continuous = np.random.uniform(0, 10, size=(N_ITERATIONS, n_dot))
+            max_elements = 2 ** n_dot * n_dot * 3
+            covered = []
+            for indices, n_list in open_charge_configurations_batched(n_continuous, threshold=1.,
+                                                                      max_elements=max_elements):
+                self.assertLessEqual(n_list.size, max_elements)
+                for i, batched_result in zip(indices, n_list):
+                    result = open_charge_configurations(n_continuous[i], threshold=1.)
+                    self.assertTrue(compare_sets_for_equality(result, batched_result))
+                covered.extend(indices)
+            self.assertEqual(sorted(covered), list(range(N_ITERATIONS)))
+
+    def test_brute_force_python_open_dot(self):
+        for n_dot in range(1, 5):
+            for n_max in range(N_CHARGE_MAX):
+                result = open_change_configurations_brute_force_python(n_dot=n_dot, n_max=n_max)
+                answers = np.array(list(product(range(n_max + 1), repeat=n_dot)))
+                self.assertEqual(result.shape, ((n_max + 1) ** n_dot, n_dot))
+                self.assertTrue(compare_sets_for_equality(result, answers))
+
+    def test_brute_force_jax_closed_dot(self):
+        for n_dot in range(1, 5):
+            for n_charge in range(N_CHARGE_MAX):
+                result = closed_change_configurations_brute_force_jax(n_dot=n_dot, n_charge=n_charge)
+                answers = np.array([n for n in product(range(n_charge + 1), repeat=n_dot) if sum(n) == n_charge])
+                self.assertEqual(result.shape, answers.shape)
+                self.assertTrue(compare_sets_for_equality(result, answers))
+
+    def test_closed_ceil_table(self):
+        """
+        Test that the bit mask and combinations constructions of the closed ceil table give every way of ceiling
+        exactly k dots, in the same order as filtering the product.
+        """
+        for max_n_dot_bit_masks in [closed_dot_configurations._MAX_N_DOT_BIT_MASKS, 0]:
+            closed_dot_configurations._closed_ceil_table.cache_clear()
+            with mock.patch.object(closed_dot_configurations, '_MAX_N_DOT_BIT_MASKS', max_n_dot_bit_masks):
+                for n_dot in range(1, N_DOT_MAX):
+                    for k in range(n_dot + 1):
+                        result = closed_dot_configurations._closed_ceil_table(n_dot, k)
+                        answers = np.array([n for n in product(range(2), repeat=n_dot) if sum(n) == k])
+                        self.assertEqual(result.shape, answers.shape)
+                        self.assertTrue(np.array_equal(result, answers))
+        closed_dot_configurations._closed_ceil_table.cache_clear()
 
     def test_double_dot_no_charges(self):
         """
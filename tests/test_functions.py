@@ -17,6 +17,46 @@ class TestFunctions(unittest.TestCase):
         expected = np.array([[0, 1, 0]])
         self.assertTrue(np.allclose(result, expected))
 
+    def test_charge_state_changes_packed(self):
+        """
+        Test that the packed integer path of charge_state_changes agrees with the isclose path, including
+        occupations up to 255 on eight dots, where the topmost dot is shifted into the sign bit.
+        """
+        from qarray.functions import charge_state_changes
+
+        def isclose_changes(n):
+            change_in_x = np.logical_not(np.isclose(n[1:, :-1], n[:-1, :-1], atol=1e-3)).any(axis=-1)
+            change_in_y = np.logical_not(np.isclose(n[:-1, 1:], n[:-1, :-1], atol=1e-3)).any(axis=-1)
+            return np.logical_or(change_in_x, change_in_y)
+
+        for n_dot in range(1, 9):
+            for n_max in [1, 255]:
+                n = np.random.randint(0, n_max + 1, size=(20, 20, n_dot))
+                # making some neighbouring pixels equal, so that not every pixel is a change
+                n[::2] = n[1::2]
+                n[1, :, -1] = 255
+                packed = charge_state_changes(n)
+                # a non integer offset within the isclose tolerance forces the isclose path
+                fallback = charge_state_changes(n + 1e-6)
+                self.assertTrue(np.array_equal(packed, fallback))
+                self.assertTrue(np.array_equal(packed, isclose_changes(n)))
+
+        # neighbouring pixels which only differ in the high bits of each dot, including the topmost dot
+        for n_dot in range(2, 9):
+            for d in range(n_dot - 1):
+                n = np.zeros((2, 2, n_dot), dtype=int)
+                n[:, 0, d + 1] = 1
+                n[0, 1, d] = 128
+                self.assertTrue(np.array_equal(charge_state_changes(n), [[True]]))
+            n = np.zeros((2, 2, n_dot), dtype=int)
+            n[:, 0, -1] = 255
+            n[0, 1, -1] = 127
+            self.assertTrue(np.array_equal(charge_state_changes(n), [[True]]))
+
+        # nine dots or negative occupations cannot be packed, so must take the isclose path
+        for n in [np.random.randint(0, 3, size=(20, 20, 9)), np.random.randint(-2, 3, size=(20, 20, 3))]:
+            self.assertTrue(np.array_equal(charge_state_changes(n), isclose_changes(n)))
+
     def test_charge_state_contrast(self):
         from qarray.functions import charge_state_dot_product
 
@@ -2,7 +2,8 @@ import unittest
 
 import numpy as np
 
-from qarray import charge_state_to_scalar
+from qarray import charge_state_to_scalar, DotArray
+from qarray.DotArrays._helper_functions import convert_to_maxwell
 
 
 class TestChargeStateToUniqueIndex(unittest.TestCase):
@@ -17,3 +18,24 @@ class TestChargeStateToUniqueIndex(unittest.TestCase):
 
         n_unique = charge_state_to_scalar(n)
         assert np.all(n_unique == np.array([[0, 2, 1, 3]]))
+
+
+class TestConvertToMaxwell(unittest.TestCase):
+
+    def test_integer_cdd(self):
+        """
+        Test that an integer valued cdd matrix, with a float valued cgd matrix, does not truncate the total
+        capacitances on the diagonal of the Maxwell cdd matrix.
+        """
+        cdd_non_maxwell = np.array([[0, 1], [1, 0]])
+        cgd_non_maxwell = np.array([[1, 0.2], [0.1, 1]])
+
+        cdd, cdd_inv, cgd = convert_to_maxwell(cdd_non_maxwell, cgd_non_maxwell)
+
+        expected = np.diag(cdd_non_maxwell.sum(axis=1) + cgd_non_maxwell.sum(axis=1)) - cdd_non_maxwell
+        self.assertTrue(np.allclose(cdd, expected))
+        self.assertTrue(np.allclose(cdd_inv, np.linalg.inv(expected)))
+        self.assertTrue(np.allclose(cgd, -cgd_non_maxwell))
+
+        model = DotArray(Cdd=cdd_non_maxwell.tolist(), Cgd=cgd_non_maxwell.tolist())
+        self.assertTrue(np.allclose(model.cdd, expected))
@@ -4,13 +4,14 @@ when all changes are positive.
 """
 
 import unittest
+from functools import partial
 from time import perf_counter
 
 import numpy as np
 
 from qarray.python_implementations.default_and_thresholded_python.default_or_thresholded_python import \
     init_osqp_problem, compute_analytical_solution_open, \
-    compute_analytical_solution_closed
+    compute_analytical_solution_closed, solve_osqp_problems
 from .GLOBAL_OPTIONS import N_ITERATIONS, N_VOLTAGES, ATOL
 from .helper_functions import randomly_generate_model
 
@@ -157,3 +158,34 @@ class TestOsqpSolver(unittest.TestCase):
                                     msg=f'vg: {vg}, {analytical_solution}, {res.x}')
 
         print(f'Average time: {t / N}')
+
+    def test_threaded_solver(self):
+        """
+        This test checks that the output of the solver split across several threads is identical to the output of the
+        serial solver with the same chunks, and that both agree with a single warm started chain when the solver
+        tolerances are tightened, for both the open and closed arrays.
+        :return:
+        """
+        n_dot = 3
+        n_gate = 3
+
+        def init_tight_prob(**kwargs):
+            prob = init_osqp_problem(**kwargs)
+            prob.update_settings(eps_abs=1e-6, eps_rel=1e-6)
+            return prob
+
+        models = randomly_generate_model(n_dot, n_gate, N_ITERATIONS)
+        for model in models:
+            # negative gate voltages, so that the constrained solver is needed at every point
+            vg_list = np.random.uniform(-5, 0, (300, n_gate))
+            q = -(model.cdd_inv @ model.cgd) @ vg_list.T
+
+            for n_charge in [None, 3]:
+                init_prob = partial(init_tight_prob, cdd_inv=model.cdd_inv, cgd=model.cgd, n_charge=n_charge)
+                serial = solve_osqp_problems(q=q, init_prob=init_prob, chunk_size=7, max_workers=1)
+                threaded = solve_osqp_problems(q=q, init_prob=init_prob, chunk_size=7, max_workers=4)
+                single_chain = solve_osqp_problems(q=q, init_prob=init_prob, chunk_size=q.shape[-1])
+
+                self.assertEqual(threaded.shape, (vg_list.shape[0], n_dot))
+                self.assertTrue(np.array_equal(serial, threaded))
+                self.assertTrue(np.allclose(single_chain, threaded, atol=ATOL))